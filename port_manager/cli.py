@@ -10,12 +10,24 @@
 """
 
 import os
+import re
+import errno
 import sys
+import enum
 import json
 import time
-import psutil
-import argparse
-from typing import Optional
+import socket
+import types
+import select
+import struct
+import functools
+import subprocess
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+# psutil is imported where it is used, so --version, --help and argument
+# errors do not pay for loading it
+if TYPE_CHECKING:
+    import psutil
 
 # ─── Terminal Colors ───────────────────────────────────────────
 RESET = "\033[0m"
@@ -23,6 +35,33 @@ RED = "\033[91m"
 GREEN = "\033[92m"
 YELLOW = "\033[93m"
 BLUE = "\033[94m"
+_ANSI_COLORS = (RESET, RED, GREEN, YELLOW, BLUE)
+
+
+def _init_colors(enabled: bool) -> None:
+    """Bind the color constants and the message templates built from them.
+
+    Disabling colors binds every constant to an empty string, so no escape
+    bytes end up in piped output or JSON mode.
+    """
+    global _colors_enabled, RESET, RED, GREEN, YELLOW, BLUE
+    global _PORT_FREE_MSG, _WAITING_MSG, _RELEASED_MARK, _NOT_RELEASED_MARK
+    _colors_enabled = enabled
+    RESET, RED, GREEN, YELLOW, BLUE = _ANSI_COLORS if enabled else ("",) * 5
+
+    # Precomputed templates for frequently printed messages
+    _PORT_FREE_MSG = f"{BLUE}✅ Port {{}} is free.{RESET}"
+    _WAITING_MSG = f"{YELLOW}⏳ Waiting for port {{}} to be released...{RESET}"
+    _RELEASED_MARK = f"{GREEN} ✓{RESET}"
+    _NOT_RELEASED_MARK = f"{RED} ✗{RESET}"
+
+
+def _stdout_wants_colors() -> bool:
+    """Only color output going to a terminal, and honor https://no-color.org."""
+    return sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+
+_init_colors(_stdout_wants_colors())
 
 # ─── Version ───────────────────────────────────────────────────
 TOOL_VERSION = "1.0.0"
@@ -32,14 +71,182 @@ DEFAULT_GRACEFUL_TIMEOUT = 5.0
 DEFAULT_FORCE_TIMEOUT = 1.0
 DEFAULT_PORT_WAIT_TIMEOUT = 3.0
 DEFAULT_PORT_CHECK_INTERVAL = 0.1
+_LISTENING_SNAPSHOT_TTL = 0.05
+
+# ─── Platform ──────────────────────────────────────────────────
+_IS_LINUX = sys.platform.startswith("linux")
+_IS_POSIX_NONROOT = os.name == "posix" and hasattr(os, "geteuid") and os.geteuid() != 0
+_HAS_TIMERFD = hasattr(os, "timerfd_create")  # Linux, Python 3.13+
+
+# ─── Linux sock_diag (netlink) Constants ──────────────────────────
+_NETLINK_SOCK_DIAG = 4
+_SOCK_DIAG_BY_FAMILY = 20
+_NLM_F_REQUEST = 0x1
+_NLM_F_DUMP = 0x300
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_TCP_LISTEN = 10
+_NLMSG_HDR = struct.Struct("=IHHII")  # nlmsghdr
+_INET_DIAG_REQ_V2 = struct.Struct("=BBBBI48s")  # inet_diag_req_v2
+_INET_DIAG_SPORT_OFFSET = 4  # inet_diag_msg.id.idiag_sport (big-endian)
+_INET_DIAG_INODE_OFFSET = 68  # inet_diag_msg.idiag_inode
+_SS_PID_RE = re.compile(r"pid=(\d+)")
+
+
+# ─── Linux Socket Lookup ───────────────────────────────────────
+def _netlink_listening_sockets() -> dict:
+    """Ask the kernel for every listening TCP socket, keyed by port.
+
+    Sends one ``SOCK_DIAG_BY_FAMILY`` dump request per address family,
+    restricted to sockets in the ``TCP_LISTEN`` state, and decodes the binary
+    ``inet_diag_msg`` replies. No ``/proc`` files are read.
+
+    Returns:
+        A ``{port: {socket inode, ...}}`` snapshot of all listening ports.
+
+    Raises:
+        OSError: If the netlink socket cannot be used (e.g. sock_diag is not
+            available in this kernel or container).
+    """
+    listening = {}
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_SOCK_DIAG) as sock:
+        for seq, family in enumerate((socket.AF_INET, socket.AF_INET6), start=1):
+            request = _INET_DIAG_REQ_V2.pack(
+                family, socket.IPPROTO_TCP, 0, 0, 1 << _TCP_LISTEN, b""
+            )
+            header = _NLMSG_HDR.pack(
+                _NLMSG_HDR.size + len(request),
+                _SOCK_DIAG_BY_FAMILY,
+                _NLM_F_REQUEST | _NLM_F_DUMP,
+                seq,
+                0,
+            )
+            sock.send(header + request)
+            _read_sock_diag_dump(sock, listening)
+    return listening
+
+
+def _read_sock_diag_dump(sock: socket.socket, listening: dict) -> None:
+    """Add the sockets from a sock_diag dump reply to a ``{port: inodes}`` map."""
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            raise OSError("netlink socket closed before the dump completed")
+
+        offset = 0
+        while offset + _NLMSG_HDR.size <= len(data):
+            length, msg_type, _, _, _ = _NLMSG_HDR.unpack_from(data, offset)
+            if length < _NLMSG_HDR.size:
+                raise OSError("malformed netlink message")
+            if msg_type == _NLMSG_DONE:
+                return
+            if msg_type == _NLMSG_ERROR:
+                (error,) = struct.unpack_from("=i", data, offset + _NLMSG_HDR.size)
+                raise OSError(-error, os.strerror(-error))
+
+            body = offset + _NLMSG_HDR.size
+            (sport,) = struct.unpack_from("!H", data, body + _INET_DIAG_SPORT_OFFSET)
+            (inode,) = struct.unpack_from("=I", data, body + _INET_DIAG_INODE_OFFSET)
+            inodes = listening.setdefault(sport, set())
+            if inode:
+                inodes.add(inode)
+            offset += (length + 3) & ~3
+
+
+def _find_pid_by_socket_inodes(inodes: set) -> Optional[int]:
+    """Return the PID of the first process holding one of the given socket inodes.
+
+    Only the ``/proc/<pid>/fd`` symlinks are read; processes we are not allowed
+    to inspect are skipped.
+    """
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            fd_dir = f"/proc/{entry.name}/fd"
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue
+            for fd in fds:
+                try:
+                    if os.readlink(f"{fd_dir}/{fd}") in targets:
+                        return int(entry.name)
+                except OSError:
+                    continue
+    return None
+
+
+def _find_pid_via_netlink(port: int) -> Optional[int]:
+    """Find the PID listening on ``port`` using netlink sock_diag (Linux only).
+
+    Returns:
+        The PID of the listening process, or None if nothing is listening or the
+        owner cannot be inspected.
+
+    Raises:
+        OSError: If netlink sock_diag is unavailable.
+    """
+    inodes = _netlink_listening_sockets().get(port)
+    if not inodes:
+        return None
+    return _find_pid_by_socket_inodes(inodes)
+
+
+def _find_pid_via_ss(port: int) -> Optional[int]:
+    """Find the PID listening on ``port`` by running iproute2's ``ss`` once.
+
+    Used when netlink cannot be queried from Python; a single ``ss`` call is
+    still far cheaper than walking ``/proc/<pid>/fd`` for every process.
+
+    Returns:
+        The PID of the listening process, or None if nothing is listening or the
+        owner is not visible to the current user.
+
+    Raises:
+        OSError: If ``ss`` is not installed, times out, or exits with an error.
+    """
+    try:
+        result = subprocess.run(
+            ["ss", "-Hlntp", f"sport = :{port}"],
+            capture_output=True,
+            text=True,
+            timeout=1,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise OSError(f"ss did not respond within {e.timeout}s") from e
+    if result.returncode != 0:
+        raise OSError(f"ss exited with status {result.returncode}")
+
+    match = _SS_PID_RE.search(result.stdout)
+    return int(match.group(1)) if match else None
+
+
+def _process_for_pid(pid: Optional[int]) -> Optional["psutil.Process"]:
+    """Build a psutil.Process for ``pid``, or None if it is gone or inaccessible."""
+    import psutil
+
+    if not pid:
+        return None
+    try:
+        return psutil.Process(pid)
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
 
 
 # ─── Core Logic ────────────────────────────────────────────────
-def find_process_on_port(port: int) -> Optional[psutil.Process]:
+def find_process_on_port(port: int) -> Optional["psutil.Process"]:
     """Find the process that is listening on a given TCP port.
 
-    This function iterates through all running processes and checks their network
-    connections to find which process (if any) is listening on the specified port.
+    On Linux the kernel is queried directly over netlink (sock_diag) for the
+    listening socket, falling back to a single ``ss`` invocation if netlink
+    cannot be used. Elsewhere, or when neither is available, the system-wide
+    socket table is enumerated once and the owning PID of the listening socket
+    is resolved to a single process object. Walking every process and asking
+    each one for its connections is only used as a fallback on platforms where
+    the socket table cannot be read without privileges (e.g. macOS as a
+    regular user).
 
     Args:
         port: The TCP port number to search for (1-65535).
@@ -52,9 +259,64 @@ def find_process_on_port(port: int) -> Optional[psutil.Process]:
         This function handles internal psutil exceptions gracefully and continues
         searching other processes. It does not raise exceptions to the caller.
     """
-    for proc in psutil.process_iter(["pid", "name"]):
+    import psutil
+
+    if _IS_LINUX:
+        for lookup in (_find_pid_via_netlink, _find_pid_via_ss):
+            try:
+                pid = lookup(port)
+            except OSError:
+                continue  # unavailable (old kernel, restricted container, no iproute2)
+            return _process_for_pid(pid)
+
+    try:
+        pid = _listening_ports_snapshot().get(port)
+    except psutil.AccessDenied:
+        return _scan_processes_for_port(port)
+    return _process_for_pid(pid)
+
+
+_listening_snapshot: Optional[tuple] = None  # (monotonic timestamp, {port: pid})
+
+
+def _listening_ports_snapshot(ttl: float = _LISTENING_SNAPSHOT_TTL) -> dict:
+    """Map each listening TCP port to the PID that owns it.
+
+    Built from a single ``psutil.net_connections(kind="tcp")`` call and reused
+    for ``ttl`` seconds, so back-to-back check/kill/verify lookups share one
+    enumeration. The PID is None when the owner is not visible to the current
+    user; the port is still listed.
+    """
+    import psutil
+
+    global _listening_snapshot
+    now = time.monotonic()
+    if _listening_snapshot is None or now - _listening_snapshot[0] > ttl:
+        listening = {}
+        for conn in psutil.net_connections(kind="tcp"):
+            if conn.status == psutil.CONN_LISTEN and not listening.get(conn.laddr.port):
+                listening[conn.laddr.port] = conn.pid
+        _listening_snapshot = (now, listening)
+    return _listening_snapshot[1]
+
+
+def _clear_listening_ports_snapshot() -> None:
+    """Drop the cached snapshot once processes may have changed (e.g. after a kill)."""
+    global _listening_snapshot
+    _listening_snapshot = None
+
+
+def _scan_processes_for_port(port: int) -> Optional["psutil.Process"]:
+    """Find the listening process by checking the connections of every process.
+
+    This is much slower than reading the socket table once, but works where
+    ``psutil.net_connections`` requires root.
+    """
+    import psutil
+
+    for proc in psutil.process_iter():
         try:
-            for conn in proc.connections(kind="inet"):
+            for conn in proc.net_connections(kind="tcp"):
                 if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
                     return proc
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
@@ -62,46 +324,221 @@ def find_process_on_port(port: int) -> Optional[psutil.Process]:
     return None
 
 
+def _port_is_free(port: int) -> Optional[bool]:
+    """Probe whether a TCP port is free by trying to bind it.
+
+    A single ``bind()`` per address family replaces a full socket-table lookup.
+    On Linux ``SO_REUSEADDR`` is set so that lingering TIME_WAIT connections do
+    not count as "in use", while an active listener still makes the bind fail.
+    Elsewhere (BSD/macOS) a TIME_WAIT entry also makes the bind fail, so a
+    failed bind is inconclusive there and the socket table has to decide.
+
+    Args:
+        port: Port number to probe.
+
+    Returns:
+        True if the port can be bound, False if it is still in use, or None if
+        the probe is not possible or inconclusive (e.g. a privileged port
+        without root, or a failed bind off Linux).
+    """
+    probes = [(socket.AF_INET, "")]
+    if socket.has_ipv6:
+        probes.append((socket.AF_INET6, "::"))
+
+    for family, host in probes:
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            continue  # Address family not supported on this host
+        try:
+            if _IS_LINUX:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if family == socket.AF_INET6:
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+            sock.bind((host, port))
+        except OSError as e:
+            if e.errno == errno.EADDRINUSE:
+                return False if _IS_LINUX else None
+            if family == socket.AF_INET6 and e.errno not in (errno.EACCES, errno.EPERM):
+                continue  # IPv6 present but not configured
+            return None
+        finally:
+            sock.close()
+    return True
+
+
+def _port_missing_from_socket_table(port: int) -> bool:
+    """Check whether no socket is listening on ``port`` using one table snapshot.
+
+    Only membership matters here, so on Linux a single netlink dump is enough
+    and no process is resolved. Unlike find_process_on_port, this also sees
+    listeners whose owner is not visible to the current user.
+    """
+    import psutil
+
+    if _IS_LINUX:
+        try:
+            return port not in _netlink_listening_sockets()
+        except OSError:
+            pass  # sock_diag unavailable; use the psutil snapshot
+
+    try:
+        return port not in _listening_ports_snapshot()
+    except psutil.AccessDenied:
+        return find_process_on_port(port) is None
+
+
+def _wait_for_exit(pid: int, timeout: float) -> Optional[bool]:
+    """Block until a process exits, using a pidfd (Linux 5.3+, Python 3.9+).
+
+    The kernel wakes us when the process dies, so nothing is polled.
+
+    Args:
+        pid: Process ID to wait for. It does not need to be our child.
+        timeout: Maximum time to wait in seconds.
+
+    Returns:
+        True if the process exited, False on timeout, or None if pidfds are
+        not supported here.
+    """
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        pidfd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return None  # e.g. ENOSYS on older kernels
+    try:
+        readable, _, _ = select.select([pidfd], [], [], timeout)
+        return bool(readable)
+    finally:
+        os.close(pidfd)
+
+
+def _open_interval_timer(interval: float) -> Optional[int]:
+    """Start a periodic ``CLOCK_MONOTONIC`` timerfd firing every ``interval`` seconds.
+
+    Reading the fd blocks until the next tick, so checks stay on a fixed
+    cadence however long each one takes, unlike sleeping for ``interval``
+    after every check.
+
+    Returns:
+        The timer file descriptor, or None where timerfd is unavailable.
+    """
+    if not _HAS_TIMERFD or interval <= 0:
+        return None
+    fd = os.timerfd_create(time.CLOCK_MONOTONIC)
+    _arm_interval_timer(fd, interval)
+    return fd
+
+
+def _arm_interval_timer(fd: int, interval: float) -> None:
+    """(Re)start a timerfd so its first tick is ``interval`` seconds from now.
+
+    Re-arming also discards any ticks that have expired but not been read.
+    """
+    os.timerfd_settime(fd, initial=interval, interval=interval)
+
+
 def wait_for_port_release(
     port: int,
     max_wait: float = DEFAULT_PORT_WAIT_TIMEOUT,
     check_interval: float = DEFAULT_PORT_CHECK_INTERVAL,
+    pid: Optional[int] = None,
 ) -> bool:
     """Wait for a port to be released after process termination.
 
+    The port is always checked at least once, even if ``max_wait`` has already
+    elapsed.
+
     Args:
         port: Port number to check
         max_wait: Maximum time to wait in seconds
         check_interval: Time between checks in seconds
+        pid: Process that held the port. While it is alive, and where pidfds
+            are supported, each wait between checks also ends as soon as it
+            exits, so the port is probed right after its death.
 
     Returns:
         True if port becomes free, False if timeout
     """
-    import sys
+    start_time = now = time.monotonic()
+    deadline = start_time + max_wait
+    last_progress = start_time
 
-    start_time = time.time()
-    check_count = 0
+    print(_WAITING_MSG.format(port), end="", flush=True)
 
-    print(
-        f"{YELLOW}⏳ Waiting for port {port} to be released...{RESET}",
-        end="",
-        flush=True,
-    )
+    timer_fd = _open_interval_timer(check_interval)
+    try:
+        while True:
+            free = _port_is_free(port)
+            if free is None:
+                # Cannot bind (e.g. privileged port), so look at the socket table
+                free = _port_missing_from_socket_table(port)
+            if free:
+                print(_RELEASED_MARK)
+                return True
+
+            remaining = deadline - now
+            if remaining <= 0:
+                break
+
+            # Show a progress indicator (and flush stdout) at most once per second
+            if now - last_progress >= 1.0:
+                print(".", end="", flush=True)
+                last_progress = now
+
+            if pid is not None:
+                # Wait for the next check or the holder's exit, whichever is first
+                exited = _wait_for_exit(pid, min(check_interval, remaining))
+                if exited is None:
+                    pid = None  # pidfds are not supported, so just poll
+                else:
+                    if exited:
+                        pid = None
+                        if timer_fd is not None:
+                            # Drop the ticks that piled up during the pidfd
+                            # waits, so the cadence restarts from now
+                            _arm_interval_timer(timer_fd, check_interval)
+                    now = time.monotonic()
+                    continue
+
+            if timer_fd is not None and remaining >= check_interval:
+                os.read(timer_fd, 8)  # Blocks until the next tick
+            else:
+                # Never sleep past the deadline
+                time.sleep(min(check_interval, remaining))
+            now = time.monotonic()
+    finally:
+        if timer_fd is not None:
+            os.close(timer_fd)
+
+    print(_NOT_RELEASED_MARK)
+    return False
 
-    while time.time() - start_time < max_wait:
-        if not find_process_on_port(port):
-            print(f"{GREEN} ✓{RESET}")
-            return True
 
-        # Show progress indicator every few checks
-        check_count += 1
-        if check_count % 5 == 0:
-            print(".", end="", flush=True)
+class KillResult(enum.Enum):
+    """Outcome of kill_process_by_pid."""
 
-        time.sleep(check_interval)
+    GRACEFUL = "graceful"  # The process exited after SIGTERM
+    FORCED = "forced"  # The process exited after SIGKILL
+    GONE = "gone"  # The process had already exited
+    DENIED = "denied"  # Not permitted to signal the process
+    TIMED_OUT = "timed_out"  # The process survived SIGKILL
+    FAILED = "failed"  # Unexpected error
 
-    print(f"{RED} ✗{RESET}")
-    return False
+
+class KillOutcome(NamedTuple):
+    """Result of kill_process_by_pid, with the error text for unexpected failures."""
+
+    result: KillResult
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the process was terminated by one of our signals."""
+        return self.result in (KillResult.GRACEFUL, KillResult.FORCED)
 
 
 def kill_process_by_pid(
@@ -109,7 +546,8 @@ def kill_process_by_pid(
     force: bool = False,
     graceful_timeout: float = DEFAULT_GRACEFUL_TIMEOUT,
     force_timeout: float = DEFAULT_FORCE_TIMEOUT,
-) -> bool:
+    proc: Optional["psutil.Process"] = None,
+) -> KillOutcome:
     """Terminate a process by its PID using graceful or force methods.
 
     This function attempts to terminate a process, first using SIGTERM (graceful)
@@ -120,92 +558,80 @@ def kill_process_by_pid(
         force: If True, use SIGKILL immediately instead of trying graceful termination first.
         graceful_timeout: Time to wait for graceful termination (SIGTERM) in seconds.
         force_timeout: Time to wait for force termination (SIGKILL) in seconds.
+        proc: Already-resolved process for ``pid``. Saves a second process
+            lookup when the caller found it via find_process_on_port.
 
     Returns:
-        True if the process was successfully terminated within the timeout periods,
-        False if termination failed or timed out.
+        KillOutcome whose result is KillResult.GRACEFUL or KillResult.FORCED
+        depending on which signal terminated the process, KillResult.GONE if
+        it had already exited, or KillResult.DENIED, KillResult.TIMED_OUT or
+        KillResult.FAILED if it could not be terminated. For FAILED, its
+        error holds the exception text.
 
     Note:
-        This function prints status messages to stdout/stderr during operation.
-        For force=True, a timeout usually indicates a serious system issue.
+        This function prints nothing; the CLI reports the outcome through
+        _print_kill_result.
     """
-    # Use appropriate timeout based on kill type
-    timeout = force_timeout if force else graceful_timeout
+    import psutil
 
     try:
-        proc = psutil.Process(pid)
-        print(
-            f"{YELLOW}🔍 Attempting to {'forcefully' if force else 'gracefully'} terminate PID {pid} ({proc.name()}){RESET}"
-        )
-        proc.kill() if force else proc.terminate()
-        proc.wait(timeout=timeout)
-
-        print(f"{GREEN}✅ Process {pid} terminated successfully.{RESET}")
-        return True
-    except psutil.TimeoutExpired:
+        if proc is None:
+            proc = psutil.Process(pid)
         if not force:
-            print(
-                f"{YELLOW}⚠️ Graceful termination failed. Retrying forcefully...{RESET}"
-            )
-            return kill_process_by_pid(
-                pid,
-                force=True,
-                graceful_timeout=graceful_timeout,
-                force_timeout=force_timeout,
-            )
-        print(
-            f"{RED}❌ Process {pid} did not respond to SIGKILL within {timeout}s. This may indicate a system issue or zombie process.{RESET}"
-        )
-        return False
-    except psutil.NoSuchProcess:
-        print(
-            f"{RED}❌ No process with PID {pid} found. The process may have already exited.{RESET}"
-        )
-        return False
-    except psutil.AccessDenied:
-        print(
-            f"{RED}🚫 Access denied to terminate PID {pid}. Try running with sudo: 'sudo port-manager kill-force {pid}'{RESET}"
-        )
-        return False
-    except Exception as e:
-        print(
-            f"{RED}❌ Unexpected error while terminating process {pid}: {e}. Try using 'ps aux | grep {pid}' to check process status.{RESET}"
-        )
-        return False
+            proc.terminate()
+            try:
+                proc.wait(timeout=graceful_timeout)
+                return KillOutcome(KillResult.GRACEFUL)
+            except psutil.TimeoutExpired:
+                pass
+
+        proc.kill()
+        proc.wait(timeout=force_timeout)
+        return KillOutcome(KillResult.FORCED)
+    except psutil.TimeoutExpired:
+        return KillOutcome(KillResult.TIMED_OUT)
     except psutil.NoSuchProcess:
-        print(
-            f"{RED}❌ No process with PID {pid} found. The process may have already exited.{RESET}"
-        )
-        return False
+        return KillOutcome(KillResult.GONE)
     except psutil.AccessDenied:
-        print(
-            f"{RED}🚫 Access denied to terminate PID {pid}. Try running with sudo: 'sudo port-manager kill-force {pid}'{RESET}"
-        )
-        return False
+        return KillOutcome(KillResult.DENIED)
     except Exception as e:
+        return KillOutcome(KillResult.FAILED, str(e))
+
+
+def _print_kill_result(
+    pid: int,
+    outcome: KillOutcome,
+    force: bool,
+    force_timeout: float = DEFAULT_FORCE_TIMEOUT,
+) -> None:
+    """Print the status message for a kill_process_by_pid outcome."""
+    result = outcome.result
+    if result is KillResult.FORCED and not force:
+        print(f"{YELLOW}⚠️ Graceful termination failed. Retried forcefully.{RESET}")
+    if outcome.succeeded:
+        print(f"{GREEN}✅ Process {pid} terminated successfully.{RESET}")
+    elif result is KillResult.TIMED_OUT:
         print(
-            f"{RED}❌ Unexpected error while terminating process {pid}: {e}. Try using 'ps aux | grep {pid}' to check process status.{RESET}"
+            f"{RED}❌ Process {pid} did not respond to SIGKILL within {force_timeout}s. This may indicate a system issue or zombie process.{RESET}"
         )
-        return False
-    except psutil.NoSuchProcess:
+    elif result is KillResult.GONE:
         print(
             f"{RED}❌ No process with PID {pid} found. The process may have already exited.{RESET}"
         )
-        return False
-    except psutil.AccessDenied:
+    elif result is KillResult.DENIED:
         print(
             f"{RED}🚫 Access denied to terminate PID {pid}. Try running with sudo: 'sudo port-manager kill-force {pid}'{RESET}"
         )
-        return False
-    except Exception as e:
+    else:
         print(
-            f"{RED}❌ Unexpected error while terminating process {pid}: {e}. Try using 'ps aux | grep {pid}' to check process status.{RESET}"
+            f"{RED}❌ Unexpected error while terminating process {pid}: {outcome.error}. Try using 'ps aux | grep {pid}' to check process status.{RESET}"
         )
-        return False
 
 
 # ─── CLI Interface ─────────────────────────────────────────────
-def handle_check_command(port: int, proc: Optional[psutil.Process]) -> tuple[dict, str]:
+def handle_check_command(
+    port: int, proc: Optional["psutil.Process"]
+) -> tuple[dict, str]:
     """Handle the check command logic.
 
     Returns:
@@ -220,20 +646,19 @@ def handle_check_command(port: int, proc: Optional[psutil.Process]) -> tuple[dic
 
     if proc:
         result["status"] = "in_use"
-        result["process"] = {"pid": proc.pid, "name": proc.name()}
-        msg = (
-            f"{GREEN}✅ Port {port} is in use by PID {proc.pid} ({proc.name()}){RESET}"
-        )
+        name = proc.name()
+        result["process"] = {"pid": proc.pid, "name": name}
+        msg = f"{GREEN}✅ Port {port} is in use by PID {proc.pid} ({name}){RESET}"
     else:
         result["status"] = "free"
-        msg = f"{BLUE}✅ Port {port} is free.{RESET}"
+        msg = _PORT_FREE_MSG.format(port)
 
     return result, msg
 
 
 def handle_kill_command(
     port: int,
-    proc: Optional[psutil.Process],
+    proc: Optional["psutil.Process"],
     force: bool,
     graceful_timeout: float = DEFAULT_GRACEFUL_TIMEOUT,
     force_timeout: float = DEFAULT_FORCE_TIMEOUT,
@@ -245,6 +670,8 @@ def handle_kill_command(
     Returns:
         tuple: (result_dict, message_string)
     """
+    import psutil
+
     command = "kill-force" if force else "kill"
     result = {
         "command": command,
@@ -254,26 +681,45 @@ def handle_kill_command(
     }
 
     if proc:
-        # Double-check that the process still exists before attempting to kill it
+        already_exited_msg = f"{YELLOW}⚠️ Process {proc.pid} has already exited.{RESET}"
         try:
-            # This will raise NoSuchProcess if the process no longer exists
-            proc.status()  # Quick check that process is still accessible
+            # Memoize the name now: it can no longer be read once the process exits
+            name = proc.name()
         except psutil.NoSuchProcess:
             result["status"] = "process_already_exited"
-            msg = f"{YELLOW}⚠️ Process {proc.pid} ({proc.name()}) has already exited.{RESET}"
-            return result, msg
+            return result, already_exited_msg
 
-        result["process"] = {"pid": proc.pid, "name": proc.name()}
-        success = kill_process_by_pid(
+        result["process"] = {"pid": proc.pid, "name": name}
+        print(
+            f"{YELLOW}🔍 Attempting to {'forcefully' if force else 'gracefully'} terminate PID {proc.pid} ({name}){RESET}"
+        )
+        outcome = kill_process_by_pid(
             proc.pid,
             force=force,
             graceful_timeout=graceful_timeout,
             force_timeout=force_timeout,
+            proc=proc,
         )
-        # Always check if port becomes free, regardless of process termination status
-        port_freed = wait_for_port_release(
-            port, max_wait=port_wait_timeout, check_interval=port_check_interval
-        )
+        if outcome.result is KillResult.GONE:
+            # Not an error: the already-exited message below says it all
+            result["status"] = "process_already_exited"
+            return result, already_exited_msg
+        _print_kill_result(proc.pid, outcome, force, force_timeout)
+
+        success = outcome.succeeded
+        _clear_listening_ports_snapshot()
+        # Once the process is gone a single bind probe usually confirms the port
+        # is free; otherwise keep checking whether it becomes free, regardless
+        # of process termination status
+        if success and _port_is_free(port):
+            port_freed = True
+        else:
+            port_freed = wait_for_port_release(
+                port,
+                max_wait=port_wait_timeout,
+                check_interval=port_check_interval,
+                pid=proc.pid,
+            )
 
         if success and port_freed:
             result["status"] = "terminated"
@@ -286,7 +732,7 @@ def handle_kill_command(
             msg = f"{YELLOW}⚠️ Process {proc.pid} may have terminated despite timeout, and port {port} is now free.{RESET}"
         else:
             result["status"] = "failed"
-            msg = f"{RED}❌ Failed to terminate process {proc.pid} ({proc.name()}) and port {port} is still in use. Try with 'kill-force' or check process permissions.{RESET}"
+            msg = f"{RED}❌ Failed to terminate process {proc.pid} ({name}) and port {port} is still in use. Try with 'kill-force' or check process permissions.{RESET}"
     else:
         result["status"] = "not_found"
         msg = f"{RED}❌ No process found using port {port}. The port may already be free.{RESET}"
@@ -294,6 +740,20 @@ def handle_kill_command(
     return result, msg
 
 
+def _dumps(result: dict) -> str:
+    """Serialize a result as indented JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(result, indent=2)
+    output = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    if not output.isascii():
+        # orjson writes raw UTF-8; keep the \uXXXX escapes so the output does
+        # not depend on orjson and prints on non-UTF-8 terminals
+        return json.dumps(result, indent=2)
+    return output
+
+
 def output_result(result: dict, message: str, json_output: bool) -> int:
     """Output the result and return appropriate exit code.
 
@@ -301,7 +761,7 @@ def output_result(result: dict, message: str, json_output: bool) -> int:
         int: Exit code (0 for success, 1 for error)
     """
     if json_output:
-        print(json.dumps(result, indent=2))
+        print(_dumps(result))
     else:
         print(message)
 
@@ -333,6 +793,8 @@ def validate_port(value: str) -> int:
         argparse.ArgumentTypeError: If the value is not a valid port number
             (not numeric, or outside the range 1-65535).
     """
+    import argparse
+
     try:
         port = int(value)
     except ValueError:
@@ -346,14 +808,69 @@ def validate_port(value: str) -> int:
     return port
 
 
-def parse_args():
+_COMMANDS = ("check", "kill", "kill-force")
+_FAST_FLAGS = {
+    "-j": "json",
+    "--json": "json",
+    "-v": "verbose",
+    "--verbose": "verbose",
+    "-d": "debug",
+    "--debug": "debug",
+}
+
+
+def _fast_parse(argv: list) -> Optional[types.SimpleNamespace]:
+    """Parse the common ``<command> <port> [-j] [-v] [-d]`` form without argparse.
+
+    Args:
+        argv: Command-line arguments, without the program name.
+
+    Returns:
+        A namespace with the same attributes as the argparse parser produces,
+        or None if argv needs the full parser (help, timeouts, errors, ...).
+    """
+    args = types.SimpleNamespace(
+        command=None,
+        port=None,
+        json=False,
+        version=False,
+        verbose=False,
+        debug=False,
+        kill_timeout=DEFAULT_GRACEFUL_TIMEOUT,
+        force_kill_timeout=DEFAULT_FORCE_TIMEOUT,
+        port_wait_timeout=DEFAULT_PORT_WAIT_TIMEOUT,
+        port_check_interval=DEFAULT_PORT_CHECK_INTERVAL,
+    )
+    positionals = []
+    for arg in argv:
+        if arg in _FAST_FLAGS:
+            setattr(args, _FAST_FLAGS[arg], True)
+        elif arg.startswith("-"):
+            return None
+        else:
+            positionals.append(arg)
+
+    if not 1 <= len(positionals) <= 2 or positionals[0] not in _COMMANDS:
+        return None
+    args.command = positionals[0]
+    if len(positionals) == 2:
+        port = positionals[1]
+        if not port.isdecimal() or not 1 <= int(port) <= 65535:
+            return None  # Let argparse report the error
+        args.port = int(port)
+    return args
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the argparse parser once per process and reuse it on later calls."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="🛠️  Manage processes on specific ports.",
         epilog="Example: ./port_manager.py check 8000",
     )
-    parser.add_argument(
-        "command", choices=["check", "kill", "kill-force"], help="Command to run"
-    )
+    parser.add_argument("command", choices=_COMMANDS, help="Command to run")
     parser.add_argument(
         "port", nargs="?", type=validate_port, help="Port number (1-65535)"
     )
@@ -393,24 +910,46 @@ def parse_args():
         default=DEFAULT_PORT_CHECK_INTERVAL,
         help=f"Time between port availability checks in seconds (default: {DEFAULT_PORT_CHECK_INTERVAL})",
     )
+    return parser
 
-    return parser.parse_args()
 
+def parse_args(argv: Optional[list] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    # The common invocation skips building the argparse parser entirely
+    args = _fast_parse(argv)
+    if args is not None:
+        return args
+    return _build_parser().parse_args(argv)
 
-def main():
-    # Quick check for --version before full argument parsing
-    if "--version" in sys.argv:
-        print(f"Port Manager CLI v{TOOL_VERSION}")
-        sys.exit(0)
 
-    args = parse_args()
+def _dispatch(args) -> int:
+    """Run the command described by parsed arguments.
 
+    Returns:
+        int: Exit code (0 for success, 1 for error)
+    """
     if args.port is None:
         print(
             f"{RED}❌ Port number is required. Usage: port-manager <command> <port>{RESET}"
         )
-        sys.exit(1)
+        return 1
+
+    if not args.json:
+        return _run_command(args)
+
+    # JSON output never contains colors. Restore the previous setting afterwards
+    # so later in-process calls are not affected.
+    colors_enabled = _colors_enabled
+    _init_colors(False)
+    try:
+        return _run_command(args)
+    finally:
+        _init_colors(colors_enabled)
+
 
+def _run_command(args) -> int:
+    """Look up the port owner, run the command and print its result."""
     port = args.port
     command = args.command
 
@@ -440,16 +979,32 @@ def main():
         }
         message = f"{RED}❌ Invalid command: {command}{RESET}"
 
-    # Output result and exit
-    exit_code = output_result(result, message, args.json)
-    sys.exit(exit_code)
+    return output_result(result, message, args.json)
+
+
+def main(argv: Optional[list] = None):
+    """Run the CLI and exit with its status code.
+
+    Args:
+        argv: Command-line arguments without the program name. Defaults to
+            ``sys.argv[1:]``; pass a list to run the CLI in-process.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Quick check for --version before full argument parsing
+    if "--version" in argv:
+        print(f"Port Manager CLI v{TOOL_VERSION}")
+        sys.exit(0)
+
+    sys.exit(_dispatch(parse_args(argv)))
 
 
 # ─── Entrypoint ────────────────────────────────────────────────
 if __name__ == "__main__":
     # Don't show warning for JSON output or version
     show_warning = "--json" not in sys.argv and "--version" not in sys.argv
-    if show_warning and os.name == "posix" and os.geteuid() != 0:
+    if show_warning and _IS_POSIX_NONROOT:
         print(
             f"{YELLOW}⚠️  Run as root or use sudo for full access to ports and processes.{RESET}"
         )
@@ -0,0 +1,50 @@
+import compileall
+import shutil
+import zipapp
+from pathlib import Path
+
+import pytest
+import port_manager
+import port_manager.cli
+from port_manager.cli import main
+
+
+@pytest.fixture(scope="module")
+def cli():
+    """The port_manager.cli module, so tests patch attributes on the object."""
+    return port_manager.cli
+
+
+@pytest.fixture
+def run_cli(capsys):
+    """Run the CLI in-process and return ``(stdout, stderr, exit_code)``."""
+
+    def run(*args):
+        try:
+            main(list(args))
+        except SystemExit as e:
+            code = e.code
+        else:
+            code = 0
+        out, err = capsys.readouterr()
+        return out, err, code
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def cli_binary(tmp_path_factory):
+    """Build the CLI once per session as a precompiled single-file zipapp."""
+    build_dir = tmp_path_factory.mktemp("cli")
+    source = build_dir / "src"
+    shutil.copytree(
+        Path(port_manager.__file__).parent,
+        source / "port_manager",
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    # zipimport only picks up .pyc files stored next to their sources
+    compileall.compile_dir(source, legacy=True, quiet=1)
+
+    target = build_dir / "port-manager.pyz"
+    zipapp.create_archive(source, target, main="port_manager.cli:main")
+    return target
@@ -1,218 +1,704 @@
+import os
+import errno
+import json
+import shutil
+import socket
 import subprocess
+import sys
+import time
+import psutil
 import pytest
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
 from unittest.mock import Mock, patch
 from port_manager.cli import (
+    KillOutcome,
+    KillResult,
+    _HAS_TIMERFD,
+    _build_parser,
+    _dumps,
+    _fast_parse,
+    _clear_listening_ports_snapshot,
+    _dispatch,
+    _port_is_free,
+    _print_kill_result,
+    _wait_for_exit,
     find_process_on_port,
+    handle_kill_command,
     kill_process_by_pid,
+    parse_args,
     wait_for_port_release,
 )
 
+PY = sys.executable
+# Minimal environment for spawned interpreters: no full copy of the parent
+# environment, and no user site-packages scan at startup
+SUBPROCESS_ENV = {
+    "PATH": os.environ.get("PATH", ""),
+    "PYTHONNOUSERSITE": "1",
+    "PYTHONDONTWRITEBYTECODE": "1",
+}
+if "PYTHONPATH" in os.environ:
+    SUBPROCESS_ENV["PYTHONPATH"] = os.environ["PYTHONPATH"]
 
-def test_script_help():
-    result = subprocess.run(
-        ["python", "-m", "port_manager.cli", "--help"], capture_output=True, text=True
+
+@dataclass
+class FakeClock:
+    """Stand-in for time.monotonic that advances by ``step`` on every read.
+
+    ``last`` is the most recent value handed out, i.e. the time the code under
+    test last saw; ``t`` is already one step ahead of it.
+    """
+
+    t: float = 0.0
+    step: float = 0.2
+    last: Optional[float] = None
+
+    def __call__(self) -> float:
+        self.last = self.t
+        self.t += self.step
+        return self.last
+
+
+def make_conn(port, pid=None, status="LISTEN"):
+    """Build a fake psutil connection entry for ``port``."""
+    return SimpleNamespace(laddr=SimpleNamespace(port=port), status=status, pid=pid)
+
+
+def make_proc(pid, name="test_proc", port=None):
+    """Build a fake psutil process, optionally listening on ``port``."""
+    conns = [] if port is None else [make_conn(port, pid=pid)]
+    return SimpleNamespace(
+        pid=pid,
+        name=lambda: name,
+        net_connections=lambda kind="inet": conns,
     )
-    assert result.returncode == 0
-    assert "usage" in result.stdout.lower()
 
 
-def test_script_version():
+@pytest.fixture(autouse=True)
+def clear_listening_ports_snapshot():
+    """Keep mocked socket tables from leaking between tests via the cache."""
+    yield
+    _clear_listening_ports_snapshot()
+
+
+def test_script_help(run_cli):
+    out, _, code = run_cli("--help")
+    assert code == 0
+    assert "usage" in out.lower()
+
+
+def test_script_version(run_cli):
+    out, _, code = run_cli("--version")
+    assert code == 0
+    assert "Port Manager CLI v" in out
+
+
+def test_psutil_version():
+    """Guard against running on psutil < 6.0, which re-adds per-process overhead."""
+    assert psutil.version_info >= (6, 0)
+
+
+def test_module_entrypoint():
+    """Smoke test that ``python -m port_manager.cli`` runs end to end."""
     result = subprocess.run(
-        ["python", "-m", "port_manager.cli", "--version"],
+        [PY, "-m", "port_manager.cli", "check", "9998"],
         capture_output=True,
         text=True,
+        env=SUBPROCESS_ENV,
     )
-    assert "Port Manager CLI v" in result.stdout
+    assert result.returncode == 0
+    assert "Port 9998 is free" in result.stdout
+    # Colors are not written when stdout is not a terminal
+    assert "\033[" not in result.stdout
 
 
 class TestPortManagerFunctions:
     """Functional tests for core port manager functions."""
 
-    def test_find_process_on_port_no_process(self, monkeypatch):
-        """Test finding process on port when no process is listening."""
-        mock_proc_iter = Mock(return_value=[])
-        monkeypatch.setattr("psutil.process_iter", mock_proc_iter)
+    @pytest.mark.parametrize(
+        "conns, expected_pid",
+        [
+            ([], None),
+            ([make_conn(8080, pid=1234)], 1234),
+            ([make_conn(8081, pid=1234)], None),
+        ],
+        ids=["no_process", "with_process", "different_port"],
+    )
+    def test_find_process_on_port(self, cli, monkeypatch, conns, expected_pid):
+        """Test finding the process listening on a port from the socket table."""
+        monkeypatch.setattr(cli, "_IS_LINUX", False)
+        monkeypatch.setattr(psutil, "net_connections", Mock(return_value=conns))
+        mock_process = Mock(side_effect=make_proc)
+        monkeypatch.setattr(psutil, "Process", mock_process)
 
         result = find_process_on_port(8080)
-        assert result is None
 
-    def test_find_process_on_port_with_process(self, monkeypatch):
-        """Test finding process on port when a process is listening."""
-        # Mock process
-        mock_proc = Mock()
-        mock_proc.pid = 1234
-        mock_proc.name.return_value = "test_server"
+        if expected_pid is None:
+            assert result is None
+            mock_process.assert_not_called()
+        else:
+            assert result.pid == expected_pid
+            mock_process.assert_called_once_with(expected_pid)
 
-        # Mock connection
-        mock_conn = Mock()
-        mock_conn.laddr.port = 8080
-        mock_conn.status = "LISTEN"
+    def test_find_process_on_port_access_denied_fallback(self, cli, monkeypatch):
+        """Test falling back to a per-process scan when the socket table is restricted."""
+        monkeypatch.setattr(cli, "_IS_LINUX", False)
+        proc = make_proc(1234, port=8080)
 
-        mock_proc.connections.return_value = [mock_conn]
-
-        # Mock process iterator
-        mock_proc_iter = Mock(return_value=[mock_proc])
-        monkeypatch.setattr("psutil.process_iter", mock_proc_iter)
+        monkeypatch.setattr(
+            psutil, "net_connections", Mock(side_effect=psutil.AccessDenied())
+        )
+        monkeypatch.setattr(psutil, "process_iter", lambda: [proc])
 
         result = find_process_on_port(8080)
-        assert result == mock_proc
-
-    def test_find_process_on_port_different_port(self, monkeypatch):
-        """Test finding process on port when process is listening on different port."""
-        # Mock process listening on port 8081, not 8080
-        mock_proc = Mock()
-        mock_conn = Mock()
-        mock_conn.laddr.port = 8081
-        mock_conn.status = "LISTEN"
-        mock_proc.connections.return_value = [mock_conn]
-
-        mock_proc_iter = Mock(return_value=[mock_proc])
-        monkeypatch.setattr("psutil.process_iter", mock_proc_iter)
+        assert result is proc
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+    def test_find_process_on_port_netlink(self):
+        """Test the netlink lookup against a real listening socket."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            port = sock.getsockname()[1]
+
+            result = find_process_on_port(port)
+            assert result is not None
+            assert result.pid == os.getpid()
+
+    @pytest.mark.skipif(shutil.which("ss") is None, reason="requires iproute2 ss")
+    def test_find_process_on_port_ss_fallback(self, cli, monkeypatch):
+        """Test the ss lookup when netlink is unavailable."""
+        monkeypatch.setattr(cli, "_find_pid_via_netlink", Mock(side_effect=OSError()))
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            port = sock.getsockname()[1]
+
+            result = find_process_on_port(port)
+            assert result is not None
+            assert result.pid == os.getpid()
+
+    def test_find_process_on_port_without_netlink_or_ss(self, cli, monkeypatch):
+        """Test falling back to psutil when neither netlink nor ss can be used."""
+        monkeypatch.setattr(cli, "_IS_LINUX", True)
+        monkeypatch.setattr(cli, "_find_pid_via_netlink", Mock(side_effect=OSError()))
+        monkeypatch.setattr(subprocess, "run", Mock(side_effect=FileNotFoundError()))
+        mock_net_connections = Mock(return_value=[])
+        monkeypatch.setattr(psutil, "net_connections", mock_net_connections)
 
         result = find_process_on_port(8080)
         assert result is None
+        mock_net_connections.assert_called_once()
+
+    def test_find_process_on_port_reuses_socket_table(self, cli, monkeypatch):
+        """Test that repeated lookups share a single socket-table enumeration."""
+        monkeypatch.setattr(cli, "_IS_LINUX", False)
+        mock_net_connections = Mock(return_value=[])
+        monkeypatch.setattr(psutil, "net_connections", mock_net_connections)
 
-    def test_kill_process_by_pid_successful_graceful(self, monkeypatch, capsys):
+        assert find_process_on_port(8080) is None
+        assert find_process_on_port(8081) is None
+        mock_net_connections.assert_called_once()
+
+    def test_kill_process_by_pid_successful_graceful(self, monkeypatch):
         """Test successful graceful process termination."""
         mock_proc = Mock()
         mock_proc.pid = 1234
         mock_proc.name.return_value = "test_proc"
 
         mock_process = Mock(return_value=mock_proc)
-        monkeypatch.setattr("psutil.Process", mock_process)
+        monkeypatch.setattr(psutil, "Process", mock_process)
 
-        result = kill_process_by_pid(1234, force=False)
+        outcome = kill_process_by_pid(1234, force=False)
 
-        assert result is True
+        assert outcome.result is KillResult.GRACEFUL
         mock_proc.terminate.assert_called_once()
         mock_proc.wait.assert_called_once_with(timeout=5.0)
 
-        # Check output
-        captured = capsys.readouterr()
-        assert "gracefully terminate" in captured.out
-        assert "terminated successfully" in captured.out
-
-    def test_kill_process_by_pid_successful_force(self, monkeypatch, capsys):
+    def test_kill_process_by_pid_successful_force(self, monkeypatch):
         """Test successful force process termination."""
         mock_proc = Mock()
         mock_proc.pid = 1234
         mock_proc.name.return_value = "test_proc"
 
         mock_process = Mock(return_value=mock_proc)
-        monkeypatch.setattr("psutil.Process", mock_process)
+        monkeypatch.setattr(psutil, "Process", mock_process)
 
-        result = kill_process_by_pid(1234, force=True)
+        outcome = kill_process_by_pid(1234, force=True)
 
-        assert result is True
+        assert outcome.result is KillResult.FORCED
         mock_proc.kill.assert_called_once()
         mock_proc.wait.assert_called_once_with(timeout=1.0)
 
-        # Check output
-        captured = capsys.readouterr()
-        assert "forcefully terminate" in captured.out
-        assert "terminated successfully" in captured.out
+    def test_kill_process_by_pid_graceful_timeout_escalates(self, monkeypatch):
+        """Test that a graceful timeout escalates to SIGKILL without a second lookup."""
+        mock_proc = Mock()
+        mock_proc.pid = 1234
+        mock_proc.name.return_value = "test_proc"
+        mock_proc.wait.side_effect = [psutil.TimeoutExpired(5.0), None]
+
+        mock_process = Mock(return_value=mock_proc)
+        monkeypatch.setattr(psutil, "Process", mock_process)
+
+        outcome = kill_process_by_pid(1234, force=False)
+
+        assert outcome.result is KillResult.FORCED
+        mock_process.assert_called_once_with(1234)
+        mock_proc.terminate.assert_called_once()
+        mock_proc.kill.assert_called_once()
+        assert mock_proc.wait.call_args_list == [
+            ((), {"timeout": 5.0}),
+            ((), {"timeout": 1.0}),
+        ]
+
+    def test_kill_process_by_pid_reuses_process(self, monkeypatch):
+        """Test that an already-resolved process is not looked up again."""
+        mock_proc = Mock()
+        mock_proc.pid = 1234
+        mock_proc.name.return_value = "test_proc"
+
+        mock_process = Mock()
+        monkeypatch.setattr(psutil, "Process", mock_process)
+
+        outcome = kill_process_by_pid(1234, force=False, proc=mock_proc)
+
+        assert outcome.result is KillResult.GRACEFUL
+        mock_process.assert_not_called()
+        mock_proc.terminate.assert_called_once()
+
+    def test_kill_process_by_pid_already_exited(self, monkeypatch):
+        """Test that a process which already exited is reported as gone."""
+        mock_process = Mock(side_effect=psutil.NoSuchProcess(1234))
+        monkeypatch.setattr(psutil, "Process", mock_process)
+
+        outcome = kill_process_by_pid(1234)
+
+        assert outcome.result is KillResult.GONE
 
-    def test_wait_for_port_release_immediate(self, monkeypatch):
+    def test_kill_process_by_pid_access_denied(self, monkeypatch):
+        """Test that a permission error is reported as denied."""
+        mock_proc = Mock()
+        mock_proc.terminate.side_effect = psutil.AccessDenied(1234)
+
+        outcome = kill_process_by_pid(1234, proc=mock_proc)
+
+        assert outcome.result is KillResult.DENIED
+        mock_proc.kill.assert_not_called()
+
+    def test_kill_process_by_pid_unexpected_error(self, capsys):
+        """Test that an unexpected error's text reaches the CLI message."""
+        mock_proc = Mock()
+        mock_proc.terminate.side_effect = RuntimeError("boom")
+
+        outcome = kill_process_by_pid(1234, proc=mock_proc)
+
+        assert outcome.result is KillResult.FAILED
+        assert outcome.error == "boom"
+        _print_kill_result(1234, outcome, force=False)
+        assert "Unexpected error while terminating process 1234: boom" in (
+            capsys.readouterr().out
+        )
+
+    def test_handle_kill_command_process_already_exited(self, cli, monkeypatch, capsys):
+        """Test that a process exiting before the kill is not reported as a failure."""
+        mock_proc = Mock()
+        mock_proc.pid = 1234
+        mock_proc.name.return_value = "test_proc"
+        monkeypatch.setattr(
+            cli, "kill_process_by_pid", Mock(return_value=KillOutcome(KillResult.GONE))
+        )
+        mock_wait = Mock()
+        monkeypatch.setattr(cli, "wait_for_port_release", mock_wait)
+
+        result, _ = handle_kill_command(8080, mock_proc, force=False)
+
+        assert result["status"] == "process_already_exited"
+        mock_proc.status.assert_not_called()
+        mock_wait.assert_not_called()
+        assert "No process with PID" not in capsys.readouterr().out
+
+    def test_wait_for_port_release_immediate(self, cli, monkeypatch):
         """Test port release check when port is immediately free."""
-        mock_find_process = Mock(return_value=None)
-        monkeypatch.setattr("port_manager.cli.find_process_on_port", mock_find_process)
+        mock_port_is_free = Mock(return_value=True)
+        monkeypatch.setattr(cli, "_port_is_free", mock_port_is_free)
 
         result = wait_for_port_release(8080)
         assert result is True
-        mock_find_process.assert_called_once_with(8080)
+        mock_port_is_free.assert_called_once_with(8080)
+
+    def test_wait_for_port_release_probe_unavailable(self, cli, monkeypatch):
+        """Test falling back to the socket table when the port cannot be probed."""
+        monkeypatch.setattr(cli, "_IS_LINUX", False)
+        monkeypatch.setattr(cli, "_port_is_free", lambda port: None)
+        # Owner of the listener is not visible to us, but the port still counts
+        mock_snapshot = Mock(side_effect=[{80: None}, {}])
+        monkeypatch.setattr(cli, "_listening_ports_snapshot", mock_snapshot)
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+        result = wait_for_port_release(80)
+        assert result is True
+        assert mock_snapshot.call_count == 2
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+    def test_wait_for_port_release_probe_unavailable_netlink(self, cli, monkeypatch):
+        """Test the netlink socket-table check against a real listening socket."""
+        monkeypatch.setattr(cli, "_port_is_free", lambda port: None)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            port = sock.getsockname()[1]
+            assert wait_for_port_release(port, max_wait=0.0) is False
+        assert wait_for_port_release(port, max_wait=0.0) is True
+
+    def test_wait_for_port_release_progress_once_per_second(
+        self, cli, monkeypatch, capsys
+    ):
+        """Test that progress dots are written at most once per second."""
+        monkeypatch.setattr(cli, "_port_is_free", lambda port: False)
+        monkeypatch.setattr(time, "monotonic", FakeClock(step=0.5))
+        monkeypatch.setattr(cli, "_HAS_TIMERFD", False)
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+        result = wait_for_port_release(8080, max_wait=3.0, check_interval=0.5)
 
-    def test_wait_for_port_release_timeout(self, monkeypatch):
-        """Test port release check timeout when port never becomes free."""
+        assert result is False
+        assert capsys.readouterr().out.count(".") == 2 + 3  # 2 dots + "..." in message
+
+    def test_wait_for_port_release_waits_for_process_exit(self, cli, monkeypatch):
+        """Test that the holder's exit ends the wait before the next check."""
+        mock_wait_for_exit = Mock(return_value=True)
+        monkeypatch.setattr(cli, "_wait_for_exit", mock_wait_for_exit)
+        mock_port_is_free = Mock(side_effect=[False, True])
+        monkeypatch.setattr(cli, "_port_is_free", mock_port_is_free)
+        mock_sleep = Mock()
+        monkeypatch.setattr(time, "sleep", mock_sleep)
+
+        result = wait_for_port_release(8080, max_wait=2.0, check_interval=0.5, pid=1234)
+
+        assert result is True
+        mock_wait_for_exit.assert_called_once_with(1234, 0.5)
+        assert mock_port_is_free.call_count == 2
+        mock_sleep.assert_not_called()
+
+    def test_handle_kill_command_failed_kill_sees_port_freed(self, cli, monkeypatch):
+        """Test that a port freed while a surviving holder runs is noticed early."""
         mock_proc = Mock()
-        mock_find_process = Mock(return_value=mock_proc)  # Always returns a process
-        monkeypatch.setattr("port_manager.cli.find_process_on_port", mock_find_process)
+        mock_proc.pid = 1234
+        mock_proc.name.return_value = "test_proc"
+        monkeypatch.setattr(
+            cli,
+            "kill_process_by_pid",
+            Mock(return_value=KillOutcome(KillResult.TIMED_OUT)),
+        )
+        # The holder never exits, but releases the port on the second check
+        mock_wait_for_exit = Mock(return_value=False)
+        monkeypatch.setattr(cli, "_wait_for_exit", mock_wait_for_exit)
+        monkeypatch.setattr(cli, "_port_is_free", Mock(side_effect=[False, True]))
+        clock = FakeClock(step=0.1)
+        monkeypatch.setattr(time, "monotonic", clock)
+
+        result, _ = handle_kill_command(
+            8080, mock_proc, force=True, port_wait_timeout=3.0, port_check_interval=0.1
+        )
 
-        # Mock time to control the loop
-        time_values = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2]  # Simulate time progression
-        mock_time = Mock(side_effect=time_values)
-        monkeypatch.setattr("time.time", mock_time)
+        assert result["status"] == "terminated_with_warnings"
+        mock_wait_for_exit.assert_called_once_with(1234, 0.1)
+        assert clock.last < 3.0
 
-        mock_time_sleep = Mock()
-        monkeypatch.setattr("time.sleep", mock_time_sleep)
+    @pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd_open")
+    def test_wait_for_exit(self):
+        """Test waiting on a real process through its pidfd."""
+        child = subprocess.Popen(
+            [PY, "-c", "import time; time.sleep(30)"], env=SUBPROCESS_ENV
+        )
+        try:
+            assert _wait_for_exit(child.pid, 0.05) is False
+            child.kill()
+            assert _wait_for_exit(child.pid, 5.0) is True
+        finally:
+            child.kill()
+            child.wait()
+
+    @pytest.mark.serial
+    def test_wait_for_port_release_stops_at_deadline(self):
+        """Test that the wait ends at max_wait instead of a full interval later."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            port = sock.getsockname()[1]
+
+            start_time = time.perf_counter()
+            result = wait_for_port_release(port, max_wait=0.3, check_interval=0.5)
+            elapsed = time.perf_counter() - start_time
+
+        assert result is False
+        assert 0.3 <= elapsed < 0.5
+
+    @pytest.mark.serial
+    @pytest.mark.skipif(not _HAS_TIMERFD, reason="requires timerfd")
+    def test_wait_for_port_release_timerfd_cadence(self, cli, monkeypatch):
+        """Test that timerfd ticks space the probes evenly up to the deadline."""
+        probes = []
+        port_is_free = cli._port_is_free
+
+        def recording_port_is_free(port):
+            probes.append(time.perf_counter())
+            return port_is_free(port)
+
+        monkeypatch.setattr(cli, "_port_is_free", recording_port_is_free)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            port = sock.getsockname()[1]
+
+            start_time = time.perf_counter()
+            result = wait_for_port_release(port, max_wait=0.5, check_interval=0.1)
+            elapsed = time.perf_counter() - start_time
+
+        assert result is False
+        assert 0.5 <= elapsed < 0.7
+        # One probe at the start and one per tick up to the deadline
+        assert len(probes) == 6
+        gaps = [b - a for a, b in zip(probes, probes[1:])]
+        assert all(0.08 <= gap < 0.15 for gap in gaps), gaps
+
+    @pytest.mark.serial
+    @pytest.mark.skipif(not _HAS_TIMERFD, reason="requires timerfd")
+    def test_wait_for_port_release_timerfd_restarts_after_exit(self, cli, monkeypatch):
+        """Test that ticks missed during the pidfd wait do not cause a burst."""
+        probes = []
+
+        def port_is_free(port):
+            probes.append(time.perf_counter())
+            return len(probes) > 3
+
+        def wait_for_exit(pid, timeout):
+            time.sleep(0.35)  # Longer than several check intervals
+            return True
+
+        monkeypatch.setattr(cli, "_port_is_free", port_is_free)
+        monkeypatch.setattr(cli, "_wait_for_exit", wait_for_exit)
+
+        result = wait_for_port_release(8080, max_wait=2.0, check_interval=0.1, pid=1)
+
+        assert result is True
+        # Probes: start, right after the exit, then one per tick from the exit
+        assert len(probes) == 4
+        assert probes[1] - probes[0] >= 0.35
+        assert probes[2] - probes[1] >= 0.08
+        assert probes[3] - probes[2] >= 0.08
+
+    def test_port_is_free(self):
+        """Test the bind probe against a real listening socket."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            port = sock.getsockname()[1]
+            assert _port_is_free(port) is False
+        assert _port_is_free(port) is True
+
+    @pytest.mark.parametrize(
+        "is_linux, bind_error, expected",
+        [
+            (True, None, True),
+            (True, OSError(errno.EADDRINUSE, "Address already in use"), False),
+            (True, OSError(errno.EACCES, "Permission denied"), None),
+            # TIME_WAIT also fails the bind off Linux, so the table decides
+            (False, OSError(errno.EADDRINUSE, "Address already in use"), None),
+        ],
+        ids=["free", "in_use", "not_permitted", "in_use_off_linux"],
+    )
+    def test_port_is_free_bind_result(
+        self, cli, monkeypatch, is_linux, bind_error, expected
+    ):
+        """Test how bind() outcomes map to the probe result."""
+        monkeypatch.setattr(cli, "_IS_LINUX", is_linux)
+        mock_sock = Mock()
+        mock_sock.bind.side_effect = bind_error
+        monkeypatch.setattr(socket, "socket", Mock(return_value=mock_sock))
+
+        assert _port_is_free(8080) is expected
+        mock_sock.bind.assert_any_call(("", 8080))
+        mock_sock.close.assert_called()
+
+    def test_handle_kill_command_time_wait_off_linux(self, cli, monkeypatch):
+        """Test that a lingering TIME_WAIT off Linux does not read as still bound."""
+        monkeypatch.setattr(cli, "_IS_LINUX", False)
+        mock_proc = Mock()
+        mock_proc.pid = 1234
+        mock_proc.name.return_value = "test_proc"
+        monkeypatch.setattr(
+            cli,
+            "kill_process_by_pid",
+            Mock(return_value=KillOutcome(KillResult.GRACEFUL)),
+        )
+        mock_sock = Mock()
+        mock_sock.bind.side_effect = OSError(errno.EADDRINUSE, "Address in use")
+        monkeypatch.setattr(socket, "socket", Mock(return_value=mock_sock))
+        monkeypatch.setattr(psutil, "net_connections", Mock(return_value=[]))
+
+        result, _ = handle_kill_command(8080, mock_proc, force=False)
+
+        assert result["status"] == "terminated"
+
+    def test_wait_for_port_release_timeout(self, cli, monkeypatch):
+        """Test port release check timeout when port never becomes free."""
+        # Port always stays bound
+        monkeypatch.setattr(cli, "_port_is_free", lambda port: False)
+
+        # Fake clock to control the loop
+        clock = FakeClock(step=0.2)
+        monkeypatch.setattr(time, "monotonic", clock)
+        monkeypatch.setattr(cli, "_HAS_TIMERFD", False)
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
 
         result = wait_for_port_release(8080, max_wait=1.0, check_interval=0.2)
 
         assert result is False
-        # Should check multiple times until timeout
-        assert mock_find_process.call_count >= 4  # At least 4 calls before timeout
+        # Gave up only once the deadline had passed
+        assert clock.last >= 1.0
+
+
+class TestJSONOutput:
+    """Tests for JSON serialization of results."""
+
+    RESULT = {
+        "command": "check",
+        "port": 8080,
+        "status": "in_use",
+        "process": {"pid": 1234, "name": "test_server"},
+    }
+    NON_ASCII_RESULT = {**RESULT, "process": {"pid": 1234, "name": "café_server"}}
+
+    @pytest.mark.parametrize(
+        "result", [RESULT, NON_ASCII_RESULT], ids=["ascii", "non_ascii"]
+    )
+    def test_dumps_without_orjson(self, monkeypatch, result):
+        """Test that the standard library is used when orjson is missing."""
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        assert _dumps(result) == json.dumps(result, indent=2)
+
+    @pytest.mark.parametrize(
+        "result", [RESULT, NON_ASCII_RESULT], ids=["ascii", "non_ascii"]
+    )
+    def test_dumps_with_orjson(self, result):
+        """Test that orjson output matches the standard library byte for byte."""
+        pytest.importorskip("orjson")
+        output = _dumps(result)
+        assert json.loads(output) == result
+        assert output == json.dumps(result, indent=2)
+
+
+class TestArgumentParsing:
+    """Tests for the argparse-free fast path."""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["check", "8000"],
+            ["kill", "8000", "--json"],
+            ["-j", "kill-force", "1"],
+            ["check", "65535", "-v", "-d"],
+            ["check"],
+        ],
+    )
+    def test_fast_parse_matches_argparse(self, argv):
+        """Test that the fast path produces the same namespace as argparse."""
+        assert vars(_fast_parse(argv)) == vars(_build_parser().parse_args(argv))
+
+    def test_parser_is_built_once(self):
+        """Test that the argparse parser is reused rather than rebuilt."""
+        assert _build_parser() is _build_parser()
+
+    def test_dispatch_returns_exit_code(self, capsys):
+        """Test that dispatching parsed arguments returns instead of exiting."""
+        assert _dispatch(parse_args(["check", "9998"])) == 0
+        assert "Port 9998 is free" in capsys.readouterr().out
+        assert _dispatch(parse_args(["check"])) == 1
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["--help"],
+            ["check", "8000", "--kill-timeout", "2"],
+            ["check", "abc"],
+            ["check", "0"],
+            ["invalid", "8000"],
+            ["check", "8000", "9000"],
+            ["check", "²"],
+        ],
+    )
+    def test_fast_parse_falls_back(self, argv):
+        """Test that anything beyond the common form is left to argparse."""
+        assert _fast_parse(argv) is None
 
 
+@pytest.mark.serial
 class TestPerformance:
     """Performance tests to ensure operations complete within reasonable time."""
 
-    def test_find_process_on_port_performance(self, monkeypatch):
+    def test_find_process_on_port_performance(self, cli, monkeypatch):
         """Test that finding a process on port completes quickly."""
-        import time
+        monkeypatch.setattr(cli, "_IS_LINUX", False)
 
-        # Mock empty process list for fast execution
-        mock_proc_iter = Mock(return_value=[])
-        monkeypatch.setattr("psutil.process_iter", mock_proc_iter)
+        # Mock empty connection table for fast execution
+        mock_net_connections = Mock(return_value=[])
+        monkeypatch.setattr(psutil, "net_connections", mock_net_connections)
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = find_process_on_port(8080)
-        end_time = time.time()
+        end_time = time.perf_counter()
 
         # Should complete in well under 1 second
         assert end_time - start_time < 0.1
         assert result is None
 
-    def test_wait_for_port_release_timeout_performance(self, monkeypatch):
+    def test_wait_for_port_release_timeout_performance(self, cli, monkeypatch):
         """Test that port release wait times out within expected duration."""
-        import time
-
-        mock_proc = Mock()
-        mock_find_process = Mock(return_value=mock_proc)
-        monkeypatch.setattr("port_manager.cli.find_process_on_port", mock_find_process)
+        mock_port_is_free = Mock(return_value=False)
+        monkeypatch.setattr(cli, "_port_is_free", mock_port_is_free)
 
-        mock_time = Mock(
-            side_effect=[0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
-        )  # More time checks to avoid StopIteration
-        monkeypatch.setattr("time.time", mock_time)
+        monkeypatch.setattr(time, "monotonic", FakeClock(step=0.1))
+        monkeypatch.setattr(cli, "_HAS_TIMERFD", False)
 
         mock_time_sleep = Mock()
-        monkeypatch.setattr("time.sleep", mock_time_sleep)
+        monkeypatch.setattr(time, "sleep", mock_time_sleep)
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = wait_for_port_release(8080, max_wait=0.5, check_interval=0.1)
-        end_time = time.time()
+        end_time = time.perf_counter()
 
         # Should complete in reasonable time (mocked time doesn't affect real sleeps)
         assert end_time - start_time < 2.0  # Allow some time for execution
         assert result is False
 
-    def test_kill_process_by_pid_fast_failure(self, monkeypatch, capsys):
+    def test_kill_process_by_pid_fast_failure(self, monkeypatch):
         """Test that kill_process_by_pid fails quickly for non-existent process."""
-        import time
-
         mock_process = Mock(side_effect=Exception("No such process"))
-        monkeypatch.setattr("psutil.Process", mock_process)
+        monkeypatch.setattr(psutil, "Process", mock_process)
 
-        start_time = time.time()
-        result = kill_process_by_pid(99999, force=True)
-        end_time = time.time()
+        start_time = time.perf_counter()
+        outcome = kill_process_by_pid(99999, force=True)
+        end_time = time.perf_counter()
 
         # Should complete very quickly
         assert end_time - start_time < 0.01
-        assert result is False
+        assert outcome.result is KillResult.FAILED
 
-    def test_cli_check_command_performance(self):
+    def test_cli_check_command_performance(self, cli_binary):
         """Test that CLI check command responds within reasonable time."""
-        import time
-        import subprocess
-
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = subprocess.run(
-            ["python", "-m", "port_manager.cli", "check", "9999"],
-            capture_output=True,
-            text=True,
+            [PY, str(cli_binary), "check", "9999"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=SUBPROCESS_ENV,
             timeout=10,  # Fail if it takes more than 10 seconds
         )
-        end_time = time.time()
+        end_time = time.perf_counter()
 
         # Should complete in under 5 seconds (allowing for some system variability)
         assert end_time - start_time < 5.0
@@ -222,58 +708,52 @@ class TestPerformance:
 class TestCLIIntegration:
     """Integration tests for complete CLI workflows."""
 
-    def test_check_free_port(self):
-        """Test checking a port that should be free."""
-        result = subprocess.run(
-            ["python", "-m", "port_manager.cli", "check", "9998"],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 0
-        assert "Port 9998 is free" in result.stdout
-
-    def test_check_invalid_command(self):
-        """Test invalid command returns error."""
-        result = subprocess.run(
-            ["python", "-m", "port_manager.cli", "invalid", "8080"],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 2  # argparse error
-        assert "invalid choice" in result.stderr
-
-    def test_kill_no_process(self):
-        """Test killing when no process is using the port."""
-        result = subprocess.run(
-            ["python", "-m", "port_manager.cli", "kill", "9997"],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 1  # Should return error code for kill commands
-        assert "No process found" in result.stdout
+    @pytest.mark.parametrize(
+        "argv, expected_code, expected_out",
+        [
+            (["check", "9998"], 0, "Port 9998 is free"),
+            (["kill", "9997"], 1, "No process found"),
+            (["check"], 1, "Port number is required"),
+        ],
+        ids=["check_free_port", "kill_no_process", "missing_port"],
+    )
+    def test_cli_command(self, run_cli, argv, expected_code, expected_out):
+        """Test exit code and output of complete CLI invocations."""
+        out, _, code = run_cli(*argv)
+        assert code == expected_code
+        assert expected_out in out
 
-    def test_json_output_check(self):
+    def test_json_output_check(self, run_cli):
         """Test JSON output for check command."""
-        result = subprocess.run(
-            ["python", "-m", "port_manager.cli", "check", "9996", "--json"],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 0
+        out, _, code = run_cli("check", "9996", "--json")
+        assert code == 0
 
-        import json
-
-        data = json.loads(result.stdout.strip())
-        assert "status" in data
+        data = json.loads(out.strip())
         assert data["port"] == 9996
         assert data["status"] == "free"
 
-    def test_missing_port_argument(self):
-        """Test that missing port argument shows error."""
-        result = subprocess.run(
-            ["python", "-m", "port_manager.cli", "check"],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 1  # Custom error handling
-        assert "Port number is required" in result.stdout
+    def test_no_color_disables_colors(self, cli, monkeypatch):
+        """Test that NO_COLOR turns colors off even on a terminal."""
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        assert cli._stdout_wants_colors()
+        monkeypatch.setenv("NO_COLOR", "1")
+        assert not cli._stdout_wants_colors()
+
+    def test_json_output_keeps_colors_for_later_calls(self, cli, run_cli):
+        """Test that --json output is uncolored without disabling colors for good."""
+        colors_enabled = cli._colors_enabled
+        cli._init_colors(True)
+        try:
+            out, _, _ = run_cli("check", "9996", "--json")
+            assert "\033[" not in out
+            out, _, _ = run_cli("check", "9998")
+            assert "\033[" in out
+        finally:
+            cli._init_colors(colors_enabled)
+
+    def test_check_invalid_command(self, run_cli):
+        """Test invalid command returns error."""
+        _, err, code = run_cli("invalid", "8080")
+        assert code == 2  # argparse error
+        assert "invalid choice" in err